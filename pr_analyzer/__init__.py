@@ -0,0 +1 @@
+"""Azure DevOps PR Review Analyzer."""
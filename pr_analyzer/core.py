@@ -0,0 +1,486 @@
+"""
+Shared fetch, filtering and reporting logic for the PR Review Analyzer.
+
+main.py and fetch_reviewed_prs.py are thin entry points around main().
+"""
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+import pandas as pd
+import argparse
+import hashlib
+import orjson
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from base64 import b64encode
+from functools import lru_cache
+from datetime import datetime, timedelta
+from pathlib import Path
+import matplotlib.pyplot as plt
+
+# ---------------- CONFIG ----------------
+ORGANIZATION = "YOUR_ORG_NAME"
+PROJECT = "YOUR_PROJECT_NAME"
+
+# Set via environment variable for safety
+# export AZURE_DEVOPS_PAT=xxxx
+PAT = os.getenv("AZURE_DEVOPS_PAT")
+# --------------------------------------
+
+# Reports and the response cache live at the repository root
+OUTPUT_DIR = Path(__file__).resolve().parent.parent
+
+# Basic auth header, encoded once at import (None if the PAT is missing)
+AUTH_HEADER = (
+    {"Authorization": "Basic " + b64encode((":" + PAT).encode()).decode()}
+    if PAT
+    else None
+)
+
+# Shared session so paginated calls reuse keep-alive connections.
+# Created by init_session() so importing the module touches no files.
+SESSION = None
+
+# Repositories fetched concurrently (MAX_WORKERS * PAGE_WORKERS <= pool_maxsize)
+MAX_WORKERS = 8
+# Pages per repository fetched concurrently after the first probe page
+PAGE_WORKERS = 4
+# PRs buffered between fetch workers and the report loop
+QUEUE_SIZE = 1000
+
+# Reviewer email -> Azure DevOps identity id (None if unresolved)
+REVIEWER_IDS = {}
+
+
+def auth_header():
+    if not AUTH_HEADER:
+        raise RuntimeError("AZURE_DEVOPS_PAT environment variable not set")
+    return AUTH_HEADER
+
+
+def cache_key(request, **kwargs):
+    """Cache key that also varies by PAT, so tokens never share entries."""
+    key = requests_cache.create_key(request, **kwargs)
+    auth = request.headers.get("Authorization", "")
+    return hashlib.sha256(f"{key}:{auth}".encode()).hexdigest()
+
+
+def init_session(use_cache=True):
+    """
+    Create the shared session. With use_cache, responses are cached on
+    disk for an hour so re-runs skip the network.
+    """
+    global SESSION
+    headers = auth_header()
+    if use_cache:
+        SESSION = requests_cache.CachedSession(
+            cache_name=str(OUTPUT_DIR / ".pr_cache"),
+            backend="sqlite",
+            expire_after=3600,
+            key_fn=cache_key,
+        )
+    else:
+        SESSION = requests.Session()
+    SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+    SESSION.headers.update(headers)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Azure DevOps PR Review Analyzer"
+    )
+    parser.add_argument("--repos", nargs="+", required=True)
+    parser.add_argument("--reviewers", nargs="+", required=True)
+    parser.add_argument("--from", dest="start", required=True)
+    parser.add_argument("--to", dest="end", required=True)
+    parser.add_argument(
+        "--date-mode",
+        choices=["creation", "review"],
+        default="review",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug output",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch fresh data instead of using the local response cache",
+    )
+    return parser.parse_args()
+
+
+@lru_cache(maxsize=4096)
+def normalize_email(email):
+    """Lowercase an email, reusing the same string for repeat reviewers."""
+    return email.lower() if email else ""
+
+
+def parse_date(date_str):
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", ""))
+    except ValueError:
+        return None
+
+
+def date_in_range(date, start, end):
+    if not date:
+        return False
+    return start <= date < end
+
+
+def get_repo_map(repo_names):
+    url = (
+        f"https://dev.azure.com/{ORGANIZATION}/{PROJECT}"
+        f"/_apis/git/repositories?api-version=7.0"
+    )
+    repos = orjson.loads(SESSION.get(url).content)["value"]
+
+    repo_map = {
+        repo["name"]: repo["id"]
+        for repo in repos
+        if repo["name"] in repo_names
+    }
+
+    if not repo_map:
+        raise RuntimeError("No matching repositories found")
+
+    return repo_map
+
+
+def get_reviewer_ids(emails):
+    """Resolve reviewer emails to identity ids, caching lookups per run."""
+    url = f"https://vssps.dev.azure.com/{ORGANIZATION}/_apis/identities"
+    for email in emails:
+        if email in REVIEWER_IDS:
+            continue
+        try:
+            response = SESSION.get(url, params={
+                "searchFilter": "General",
+                "filterValue": email,
+                "api-version": "7.0",
+            })
+            response.raise_for_status()
+            identities = orjson.loads(response.content).get("value", [])
+        except (requests.HTTPError, orjson.JSONDecodeError) as exc:
+            # The PAT may lack Identity (Read) scope, in which case Azure
+            # answers 401/403 or an HTML sign-in page. Leave every reviewer
+            # unresolved so the caller falls back to unfiltered fetching.
+            print(f"⚠️ Reviewer identity lookup unavailable: {exc}")
+            return {email: None for email in emails}
+        REVIEWER_IDS[email] = identities[0]["id"] if identities else None
+
+    return {email: REVIEWER_IDS[email] for email in emails}
+
+
+def get_pr_page(repo_id, skip, top, criteria=""):
+    url = (
+        f"https://dev.azure.com/{ORGANIZATION}/{PROJECT}"
+        f"/_apis/git/repositories/{repo_id}/pullrequests"
+        f"?searchCriteria.status=all{criteria}"
+        f"&$top={top}&$skip={skip}&api-version=7.1"
+    )
+    response = SESSION.get(url)
+    response.raise_for_status()
+    return orjson.loads(response.content).get("value", [])
+
+
+def iter_matching_prs(repo_id, criteria=""):
+    top = 100
+    batch = get_pr_page(repo_id, 0, top, criteria)
+    yield from batch
+    if len(batch) < top:
+        return
+
+    # More pages exist: request them in speculative waves of $skip offsets
+    next_skip = top
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+        while True:
+            skips = [next_skip + i * top for i in range(PAGE_WORKERS)]
+            futures = {
+                executor.submit(get_pr_page, repo_id, skip, top, criteria): skip
+                for skip in skips
+            }
+            pages = {futures[f]: f.result() for f in as_completed(futures)}
+
+            for skip in skips:
+                batch = pages[skip]
+                yield from batch
+                if len(batch) < top:
+                    return
+            next_skip = skips[-1] + top
+
+
+def iter_all_prs(repo_id, reviewer_ids=None, min_time=None, max_time=None):
+    """
+    Yield PRs for a repository, filtered server-side where possible.
+
+    With reviewer_ids, one sweep is made per reviewer and PRs seen by
+    several reviewers are only yielded once.
+    """
+    criteria = ""
+    if min_time:
+        criteria += f"&searchCriteria.minTime={min_time}"
+    if max_time:
+        criteria += f"&searchCriteria.maxTime={max_time}"
+    if min_time or max_time:
+        criteria += "&searchCriteria.queryTimeRangeType=created"
+
+    if not reviewer_ids:
+        yield from iter_matching_prs(repo_id, criteria)
+        return
+
+    seen = set()
+    for reviewer_id in reviewer_ids:
+        reviewer_criteria = f"{criteria}&searchCriteria.reviewerId={reviewer_id}"
+        for pr in iter_matching_prs(repo_id, reviewer_criteria):
+            if pr["pullRequestId"] not in seen:
+                seen.add(pr["pullRequestId"])
+                yield pr
+
+
+def iter_repo_prs(repo_map, **filters):
+    """
+    Yield (repo_name, pr) pairs as repositories are fetched concurrently.
+
+    Workers hand PRs over through a bounded queue, so memory is limited
+    to the queue plus one wave of pages per worker rather than every
+    PR fetched. Order across repositories follows arrival.
+    """
+    arrived = queue.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        # Block on a full queue, but give up once the consumer has gone
+        while not stop.is_set():
+            try:
+                arrived.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce(repo_name, repo_id):
+        try:
+            for pr in iter_all_prs(repo_id, **filters):
+                if not put((repo_name, pr)):
+                    return
+        except Exception as exc:
+            put((repo_name, exc))
+        else:
+            put((repo_name, None))
+
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    try:
+        for repo_name, repo_id in repo_map.items():
+            executor.submit(produce, repo_name, repo_id)
+
+        remaining = len(repo_map)
+        while remaining:
+            repo_name, item = arrived.get()
+            if item is None:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                # Surface fetch errors as soon as a worker hits one
+                raise item
+            else:
+                yield repo_name, item
+    finally:
+        # Release blocked workers if the consumer stopped early
+        stop.set()
+        executor.shutdown(cancel_futures=True)
+
+
+def sorted_frame(columns):
+    """
+    Build a DataFrame from per-column lists, ordered by repository and
+    newest PR first (rows arrive interleaved across repositories).
+    """
+    return pd.DataFrame(columns).sort_values(
+        ["Repository", "PR ID"], ascending=[True, False],
+        kind="stable", ignore_index=True,
+    )
+
+
+def write_excel_report(excel_path, sheets):
+    """Write each DataFrame in sheets to its own sheet of one workbook."""
+    with pd.ExcelWriter(excel_path, engine="xlsxwriter") as writer:
+        for sheet_name, sheet_df in sheets.items():
+            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def main():
+    args = parse_args()
+    init_session(use_cache=not args.no_cache)
+    reviewers = frozenset(r.lower() for r in args.reviewers)
+
+    repo_map = get_repo_map(args.repos)
+
+    # Column-oriented buffers: one list per report column
+    rows = {col: [] for col in (
+        "Repository", "PR ID", "Title", "Reviewer", "Decision",
+        "Decision Date", "PR Created Date", "Created By", "Month",
+    )}
+    raw_rows = {col: [] for col in (
+        "Repository", "PR ID", "Reviewer", "Vote",
+        "Reviewed Date", "PR Created Date",
+    )}
+    total_prs = 0
+
+    reviewer_ids = get_reviewer_ids(reviewers)
+    unresolved = [email for email, rid in reviewer_ids.items() if not rid]
+    if unresolved:
+        # Can't filter by reviewer server-side; fall back to all PRs
+        print(f"⚠️ Could not resolve reviewer ids for: {', '.join(unresolved)}")
+
+    # Inclusive --from/--to dates as a half-open datetime range
+    start_dt = datetime.fromisoformat(args.start)
+    end_dt = datetime.fromisoformat(args.end) + timedelta(days=1)
+
+    # A PR reviewed in range must have been created before the range ends
+    max_time = end_dt.strftime("%Y-%m-%d")
+    min_time = args.start if args.date_mode == "creation" else None
+
+    prs = iter_repo_prs(
+        repo_map,
+        reviewer_ids=None if unresolved else list(reviewer_ids.values()),
+        min_time=min_time,
+        max_time=max_time,
+    )
+
+    for repo_name, pr in prs:
+        total_prs += 1
+
+        pr_created_dt = parse_date(pr.get("creationDate"))
+
+        for reviewer in pr.get("reviewers", []):
+            email = normalize_email(reviewer.get("uniqueName"))
+            vote = reviewer.get("vote", 0)
+
+            if args.debug:
+                raw_rows["Repository"].append(repo_name)
+                raw_rows["PR ID"].append(pr["pullRequestId"])
+                raw_rows["Reviewer"].append(email)
+                raw_rows["Vote"].append(vote)
+                raw_rows["Reviewed Date"].append(reviewer.get("reviewedDate"))
+                raw_rows["PR Created Date"].append(pr.get("creationDate"))
+
+            if email not in reviewers:
+                continue
+
+            if vote not in (10, 5, -10):
+                continue
+
+            decision = "Approved" if vote > 0 else "Rejected"
+
+            check_date = (
+                parse_date(reviewer["reviewedDate"])
+                if args.date_mode == "review" and "reviewedDate" in reviewer
+                else pr_created_dt
+            )
+
+            if not date_in_range(check_date, start_dt, end_dt):
+                continue
+
+            rows["Repository"].append(repo_name)
+            rows["PR ID"].append(pr["pullRequestId"])
+            rows["Title"].append(pr["title"])
+            rows["Reviewer"].append(email)
+            rows["Decision"].append(decision)
+            rows["Decision Date"].append(check_date)
+            rows["PR Created Date"].append(pr.get("creationDate"))
+            rows["Created By"].append(pr["createdBy"]["displayName"])
+            rows["Month"].append(check_date.strftime("%Y-%m"))
+
+    if args.debug:
+        raw_df = sorted_frame(raw_rows)
+        is_reviewer = raw_df["Reviewer"].isin(reviewers)
+        is_decision = raw_df["Vote"].isin((10, 5, -10))
+        rows_added = len(rows["Repository"])
+
+        debug_stats = {
+            "total_prs": total_prs,
+            "total_reviewer_entries": len(raw_df),
+            "filtered_reviewer": int((~is_reviewer).sum()),
+            "filtered_vote": int((is_reviewer & ~is_decision).sum()),
+            "filtered_date": int((is_reviewer & is_decision).sum()) - rows_added,
+            "rows_added": rows_added,
+        }
+
+        print("\n🐞 DEBUG STATS")
+        print("=" * 50)
+        for k, v in debug_stats.items():
+            print(f"{k:25}: {v}")
+
+    if not rows["Repository"]:
+        print("\n⚠️ No PR review data matched the given filters.")
+        print("Excel file will NOT be generated.")
+        return
+
+    df = sorted_frame(rows)
+
+    monthly = (
+        df.groupby(["Month", "Decision"])
+        .size()
+        .unstack(fill_value=0)
+        .reset_index()
+    )
+
+    reviewer_df = (
+        df.groupby(["Reviewer", "Decision"])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=["Approved", "Rejected"], fill_value=0)
+        .rename_axis(columns=None)
+        .reset_index()
+    )
+
+    excel_path = OUTPUT_DIR / "reviewed_prs_report.xlsx"
+
+    sheets = {
+        "All PRs": df,
+        "Monthly Summary": monthly,
+        "Reviewer Summary": reviewer_df,
+    }
+    if args.debug:
+        sheets["Raw API Data"] = raw_df
+
+    # Write the workbook in the background while the graph is rendered;
+    # pyplot isn't thread-safe, so plotting stays on the main thread.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report_future = executor.submit(write_excel_report, excel_path, sheets)
+
+        try:
+            daily = (
+                df.groupby([df["Decision Date"].dt.normalize(), "Decision"])
+                .size()
+                .unstack(fill_value=0)
+            )
+            # Label bars by day only (the index is midnight timestamps)
+            daily.index = daily.index.strftime("%Y-%m-%d")
+
+            if not daily.empty:
+                graph_path = OUTPUT_DIR / "daily_approval_graph.png"
+                daily.plot(kind="bar", figsize=(12, 6))
+                plt.title("Per-Day PR Approvals / Rejections")
+                plt.xlabel("Date")
+                plt.ylabel("Count")
+                plt.tight_layout()
+                plt.savefig(graph_path)
+                plt.close()
+                print(f"📈 Daily graph saved: {graph_path}")
+        finally:
+            # Surface any error from writing the workbook, even if plotting
+            # failed (the plot error is chained onto it in the traceback)
+            report_future.result()
+
+    print("\n📊 REVIEW SUMMARY")
+    print("=" * 50)
+    print(reviewer_df)
+    print(f"\n📄 Excel report saved at: {excel_path}")